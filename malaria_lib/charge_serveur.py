@@ -0,0 +1,118 @@
+"""
+Test de charge du serveur local de simulations
+Mesure du débit, du taux d'erreur et des latences (p50, p95, p99)
+"""
+
+import argparse
+import json
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from serveur import creer_serveur
+
+
+def _envoyer(url, job, delai=120.0):
+    """Envoie un job et lit toute la réponse NDJSON.
+
+    Renvoie `(latence en secondes, erreur)`, `erreur` valant None si le job a réussi ;
+    une erreur réseau ou HTTP est comptée comme un échec au lieu d'interrompre le test.
+    """
+    debut = time.perf_counter()
+    requete = urllib.request.Request(url + '/simuler', data=json.dumps(job).encode('utf-8'),
+                                     headers={'Content-Type': 'application/json'})
+    erreur = None
+    try:
+        with urllib.request.urlopen(requete, timeout=delai) as reponse:
+            for ligne in reponse:
+                ligne = json.loads(ligne)
+                if 'erreur' in ligne:
+                    erreur = ligne['erreur']
+    except (OSError, ValueError) as e:
+        erreur = str(e)
+    return time.perf_counter() - debut, erreur
+
+
+def generer_jobs(n_requetes, n_scenarios, graine=0):
+    """Tire `n_requetes` jobs parmi `n_scenarios` scénarios distincts (valeurs de beta et theta_1)."""
+    rng = np.random.default_rng(graine)
+    scenarios = [{'parametres': {'beta': float(b), 'theta_1': float(th)}, 'n_points': 100}
+                 for b, th in zip(rng.uniform(0.1, 1.0, n_scenarios), rng.uniform(0.0, 0.05, n_scenarios))]
+    return [scenarios[i] for i in rng.integers(0, n_scenarios, n_requetes)]
+
+
+def mesurer_charge(url, n_requetes=500, n_scenarios=100, concurrence=16):
+    """Exécute le test de charge et renvoie un dict de mesures.
+
+    Les latences (en ms) ne portent que sur les requêtes réussies ; elles valent NaN si
+    aucune n'a réussi. `erreurs` donne jusqu'à 10 messages d'échec distincts.
+    """
+    jobs = generer_jobs(n_requetes, n_scenarios)
+    debut = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrence) as executeur:
+        reponses = list(executeur.map(lambda job: _envoyer(url, job), jobs))
+    duree = time.perf_counter() - debut
+    latences = np.array([latence for latence, erreur in reponses if erreur is None])
+    erreurs = [erreur for _, erreur in reponses if erreur is not None]
+    try:
+        with urllib.request.urlopen(url + '/etat', timeout=10) as reponse:
+            etat = json.loads(reponse.read())
+    except OSError as e:
+        etat = {'erreur': str(e)}
+
+    def percentile(q):
+        return float(np.percentile(latences, q) * 1000) if len(latences) else float('nan')
+
+    return {
+        'requetes': n_requetes,
+        'reussies': len(latences),
+        'echecs': len(erreurs),
+        'taux_erreur': len(erreurs) / n_requetes if n_requetes else 0.0,
+        'duree_s': duree,
+        'debit_req_s': len(latences) / duree,
+        'p50_ms': percentile(50),
+        'p95_ms': percentile(95),
+        'p99_ms': percentile(99),
+        'max_ms': percentile(100),
+        'erreurs': sorted(set(erreurs))[:10],
+        'serveur': etat,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge du serveur de simulations")
+    parser.add_argument('--url', help="serveur existant (sinon un serveur est lancé localement)")
+    parser.add_argument('--requetes', type=int, default=500)
+    parser.add_argument('--scenarios', type=int, default=100, help="nombre de scénarios distincts")
+    parser.add_argument('--concurrence', type=int, default=16)
+    args = parser.parse_args()
+
+    httpd = None
+    url = args.url
+    if url is None:
+        httpd = creer_serveur(port=0)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{httpd.server_address[1]}"
+
+    try:
+        mesures = mesurer_charge(url.rstrip('/'), args.requetes, args.scenarios, args.concurrence)
+    finally:
+        if httpd is not None:
+            httpd.shutdown()
+            httpd.server_close()
+
+    print(f"Requêtes: {mesures['requetes']} en {mesures['duree_s']:.2f} s")
+    print(f"Échecs: {mesures['echecs']} ({mesures['taux_erreur']:.1%})")
+    for erreur in mesures['erreurs']:
+        print(f"  - {erreur}")
+    print(f"Débit (requêtes réussies): {mesures['debit_req_s']:.1f} req/s")
+    print(f"Latence p50: {mesures['p50_ms']:.1f} ms  p95: {mesures['p95_ms']:.1f} ms  "
+          f"p99: {mesures['p99_ms']:.1f} ms  max: {mesures['max_ms']:.1f} ms")
+    print(f"Serveur: {mesures['serveur']}")
+
+
+if __name__ == "__main__":
+    main()
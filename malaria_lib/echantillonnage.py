@@ -0,0 +1,183 @@
+"""
+Échantillonnage adaptatif des sorties de simulation
+Points émis selon la dynamique et aux événements, au lieu d'une grille fixe
+"""
+
+import numpy as np
+from scipy.integrate import solve_ivp
+from scipy.optimize import minimize_scalar
+from scipy.signal import find_peaks
+
+from modele import compiler
+from simulation import Parametres, VARIABLES, calculer_indicateurs
+
+
+Y0_DEMO = [3000, 500, 100, 3000, 500, 100, 3000, 500, 100]
+
+
+def _prevalence(y):
+    """Prévalence I_total / N_total d'un état (9,) ou (9, n)."""
+    return (y[2] + y[5] + y[8]) / y.sum(axis=0)
+
+
+def _evenement_seuil(seuil):
+    """Franchissement d'un seuil de prévalence, dans les deux sens."""
+    def franchissement(t, y):
+        return _prevalence(y) - seuil
+    return franchissement
+
+
+def _pics(dense, t, z, marge):
+    """Instants des maxima de `z` (prévalence mise à l'échelle, aux instants `t`) qui dépassent
+    les creux voisins d'au moins `marge`, affinés sur la sortie dense du solveur.
+
+    Le filtrage par proéminence écarte les oscillations du solveur sur les plateaux.
+    """
+    index, _ = find_peaks(z, prominence=marge)
+    instants = []
+    for i in index:
+        optimum = minimize_scalar(lambda x: -_prevalence(dense(x)), bounds=(t[i - 1], t[i + 1]),
+                                  method='bounded', options={'xatol': 1e-9 * max(1.0, abs(t[i]))})
+        instants.append(optimum.x if -optimum.fun >= _prevalence(dense(t[i])) else t[i])
+    return np.array(instants)
+
+
+def _erreur_interpolation(t, Z, i, j):
+    """Écart maximal entre les points i+1..j-1 et la corde linéaire de i à j."""
+    if j - i < 2:
+        return 0.0
+    poids = ((t[i + 1:j] - t[i]) / (t[j] - t[i]))[:, None]
+    corde = Z[i] + poids * (Z[j] - Z[i])
+    return np.abs(Z[i + 1:j] - corde).max()
+
+
+def _selectionner(t, Z, tolerance, dt_max=None):
+    """Indices des points à conserver pour que l'interpolation linéaire reste à `tolerance` de `Z`.
+
+    À partir de chaque point conservé, la corde la plus longue acceptable est cherchée
+    par pas doublés puis par dichotomie.
+    """
+    n = len(t)
+    garder = [0]
+    i = 0
+    while i < n - 1:
+        def acceptable(j):
+            if dt_max is not None and t[j] - t[i] > dt_max:
+                return False
+            return _erreur_interpolation(t, Z, i, j) <= tolerance
+
+        bon, pas = i + 1, 1
+        while bon + pas < n and acceptable(bon + pas):
+            bon += pas
+            pas *= 2
+        mauvais = min(bon + pas, n)
+        while mauvais - bon > 1:
+            milieu = (bon + mauvais) // 2
+            if acceptable(milieu):
+                bon = milieu
+            else:
+                mauvais = milieu
+        garder.append(bon)
+        i = bon
+    return np.array(garder)
+
+
+class SortieAdaptative:
+    """Sortie échantillonnée adaptativement.
+
+    - `t`, `y`: instants conservés et compartiments (n_points, 9)
+    - `evenements`: dict {nom: instants détectés} ('pic_prevalence', 'seuil_<valeur>')
+    """
+
+    def __init__(self, t, y, evenements, dense=None):
+        self.t = t
+        self.y = y
+        self.evenements = evenements
+        self._dense = dense
+
+    def __len__(self):
+        return len(self.t)
+
+    def vers_dict(self):
+        """Résultats au format de `simulation_demo()` (dict de listes), plus les événements."""
+        return self._en_dict(self.t, calculer_indicateurs(self.y))
+
+    def reechantillonner(self, t_grille):
+        """Résultats sur une grille quelconque, à partir de la sortie dense du solveur si elle
+        a été conservée, sinon par interpolation linéaire des points conservés."""
+        t_grille = np.asarray(t_grille, dtype=float)
+        if self._dense is not None:
+            y = self._dense(t_grille).T
+        else:
+            y = np.column_stack([np.interp(t_grille, self.t, self.y[:, j]) for j in range(self.y.shape[1])])
+        return self._en_dict(t_grille, calculer_indicateurs(y))
+
+    def _en_dict(self, t, valeurs):
+        resultats = {'t': t.tolist()}
+        resultats.update({nom: valeurs[:, j].tolist() for j, nom in enumerate(VARIABLES)})
+        resultats['evenements'] = {nom: instants.tolist() for nom, instants in self.evenements.items()}
+        return resultats
+
+
+def simulation_adaptative(params=None, y0=None, t_span=(0, 100), tolerance=1e-3, seuils_prevalence=(),
+                          dt_max=None, sous_pas=4, conserver_dense=True, method='RK45', rtol=1e-6,
+                          plancher_relatif=1e-2):
+    """Simule le modèle et n'émet que les points nécessaires pour décrire la dynamique.
+
+    - `params`: `Parametres` (par défaut ceux de la démonstration), dict ou vecteur
+    - `y0`: conditions initiales (par défaut celles de `simulation_demo()`)
+    - `tolerance`: écart maximal d'interpolation linéaire, relatif à l'échelle de chaque variable :
+      son amplitude, mais au moins `plancher_relatif` fois sa valeur absolue maximale (pour
+      qu'une trajectoire presque constante ne soit pas échantillonnée jusqu'au bruit du solveur)
+    - `seuils_prevalence`: seuils de prévalence dont les franchissements sont enregistrés
+    - `dt_max`: espacement maximal entre deux points émis (optionnel)
+    - `sous_pas`: points de contrôle évalués par pas du solveur via la sortie dense
+    - `conserver_dense`: garder l'interpolant du solveur pour `reechantillonner`
+
+    Les franchissements de seuils sont détectés par le solveur. Les pics de prévalence sont
+    cherchés sur les points de contrôle : seul un maximum dépassant les creux voisins de plus
+    de `tolerance` (à l'échelle de la prévalence) est retenu, puis affiné sur la sortie dense.
+    Ces instants sont ajoutés aux points émis.
+
+    Exemple d'utilisation :
+    >>> sortie = simulation_adaptative(t_span=(0, 3650), seuils_prevalence=[0.05])
+    >>> resultats = sortie.vers_dict()
+    >>> grille = sortie.reechantillonner(np.linspace(0, 3650, 500))
+    """
+    params = Parametres() if params is None else params
+    y0 = np.asarray(Y0_DEMO if y0 is None else y0, dtype=float)
+    rhs, jac = compiler().fonctions(params)
+
+    noms_seuils = [f'seuil_{s:g}' for s in seuils_prevalence]
+    options = {'jac': jac} if method in ('Radau', 'BDF', 'LSODA') else {}
+    if seuils_prevalence:
+        options['events'] = [_evenement_seuil(s) for s in seuils_prevalence]
+
+    sol = solve_ivp(rhs, t_span, y0, method=method, rtol=rtol, dense_output=True, **options)
+    if not sol.success:
+        raise RuntimeError(f"Échec de la simulation: {sol.message}")
+
+    # Points de contrôle : pas du solveur subdivisés grâce à la sortie dense
+    fractions = np.arange(sous_pas) / sous_pas
+    t_controle = np.append((sol.t[:-1, None] + np.diff(sol.t)[:, None] * fractions).ravel(), sol.t[-1])
+    y_controle = sol.sol(t_controle).T
+
+    valeurs = calculer_indicateurs(y_controle)
+    echelle = np.maximum(valeurs.max(axis=0) - valeurs.min(axis=0), plancher_relatif * np.abs(valeurs).max(axis=0))
+    Z = valeurs / np.where(echelle > 0, echelle, 1.0)
+    index = _selectionner(t_controle, Z, tolerance, dt_max)
+
+    evenements = {'pic_prevalence': _pics(sol.sol, t_controle, Z[:, VARIABLES.index('prevalence')], tolerance)}
+    evenements.update(zip(noms_seuils, sol.t_events or []))
+
+    t = t_controle[index]
+    y = y_controle[index]
+    t_ev = np.concatenate(list(evenements.values()))
+    if len(t_ev):
+        t, ordre = np.unique(np.concatenate([t, t_ev]), return_index=True)
+        y = np.concatenate([y, sol.sol(t_ev).T])[ordre]
+
+    return SortieAdaptative(t, y, evenements, dense=sol.sol if conserver_dense else None)
+
+
+__all__ = ['SortieAdaptative', 'simulation_adaptative']
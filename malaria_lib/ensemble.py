@@ -0,0 +1,240 @@
+"""
+Agrégation en ligne d'ensembles de simulations
+Moyenne, variance et quantiles par instant sans stocker les trajectoires
+"""
+
+import numpy as np
+
+from simulation import VARIABLES, calculer_indicateurs
+
+
+def _en_tableau(trajectoire):
+    """Convertit une trajectoire (dict de résultats ou tableau) en tableau (n_temps, n_variables)."""
+    if isinstance(trajectoire, dict):
+        if all(k in trajectoire for k in VARIABLES):
+            return np.column_stack([np.asarray(trajectoire[k], dtype=float) for k in VARIABLES])
+        trajectoire = np.column_stack([np.asarray(trajectoire[k], dtype=float) for k in VARIABLES[:9]])
+    y = np.asarray(trajectoire, dtype=float)
+    if y.shape[-1] == len(VARIABLES):
+        return y
+    if y.shape[-1] == 9:
+        return calculer_indicateurs(y)
+    raise ValueError(f"Trajectoire de forme {y.shape} : 9 compartiments ou {len(VARIABLES)} variables attendus")
+
+
+class AgregateurEnsemble:
+    """Agrège des trajectoires au fil de l'eau, instant par instant.
+
+    Pour chaque instant de `t` et chaque variable de `VARIABLES`, l'agrégateur maintient :
+    - moyenne et variance (algorithme de Welford, fusion de Chan pour les lots)
+    - minimum et maximum exacts
+    - un résumé de quantiles de type t-digest (`n_centroides` centroïdes pondérés)
+
+    La mémoire est en O(n_temps), indépendante du nombre de trajectoires.
+    Deux agrégateurs construits sur la même grille (par exemple dans des processus
+    différents) peuvent être combinés avec `fusionner`.
+
+    Exemple d'utilisation :
+    >>> agg = AgregateurEnsemble(t)
+    >>> for res in resultats:
+    ...     agg.ajouter(res)
+    >>> bandes = agg.quantiles([0.05, 0.5, 0.95])
+    """
+
+    def __init__(self, t, n_centroides=100, taille_tampon=64):
+        self.t = np.asarray(t, dtype=float)
+        self.n_centroides = int(n_centroides)
+        self.taille_tampon = int(taille_tampon)
+        forme = (len(self.t), len(VARIABLES))
+
+        self.n = 0
+        self._moyenne = np.zeros(forme)
+        self._m2 = np.zeros(forme)
+        self._min = np.full(forme, np.inf)
+        self._max = np.full(forme, -np.inf)
+
+        self._centres = np.zeros(forme + (self.n_centroides,))
+        self._poids = np.zeros(forme + (self.n_centroides,))
+        self._tampon = np.zeros(forme + (self.taille_tampon,))
+        self._n_tampon = 0
+
+    def ajouter(self, trajectoire):
+        """Ajoute une trajectoire : dict tel que retourné par `simulation_demo()`
+        ou tableau (n_temps, 9) / (n_temps, len(VARIABLES))."""
+        self.ajouter_lot(_en_tableau(trajectoire)[None])
+
+    def ajouter_lot(self, lot):
+        """Ajoute un lot de trajectoires de forme (n_runs, n_temps, 9) ou (n_runs, n_temps, len(VARIABLES))."""
+        lot = _en_tableau(lot)
+        if lot.ndim != 3 or lot.shape[1] != len(self.t):
+            raise ValueError(f"Lot de forme {lot.shape} incompatible avec {len(self.t)} instants")
+        k = lot.shape[0]
+        if k == 0:
+            return
+
+        moy_lot = lot.mean(axis=0)
+        m2_lot = ((lot - moy_lot) ** 2).sum(axis=0)
+        self._fusionner_moments(k, moy_lot, m2_lot)
+        np.minimum(self._min, lot.min(axis=0), out=self._min)
+        np.maximum(self._max, lot.max(axis=0), out=self._max)
+
+        # Remplissage du tampon par morceaux, compression dès qu'il est plein
+        debut = 0
+        while debut < k:
+            place = self.taille_tampon - self._n_tampon
+            fin = min(k, debut + place)
+            morceau = np.moveaxis(lot[debut:fin], 0, -1)
+            self._tampon[..., self._n_tampon:self._n_tampon + fin - debut] = morceau
+            self._n_tampon += fin - debut
+            debut = fin
+            if self._n_tampon == self.taille_tampon:
+                self._vider_tampon()
+
+    def fusionner(self, autre):
+        """Intègre dans `self` le contenu d'un autre agrégateur (même grille temporelle)."""
+        if not np.array_equal(self.t, autre.t) or self.n_centroides != autre.n_centroides:
+            raise ValueError("Agrégateurs incompatibles : grilles temporelles ou résolutions différentes")
+        if autre.n == 0:
+            return self
+
+        self._fusionner_moments(autre.n, autre._moyenne, autre._m2)
+        np.minimum(self._min, autre._min, out=self._min)
+        np.maximum(self._max, autre._max, out=self._max)
+
+        valeurs = np.concatenate([self._centres, autre._centres,
+                                  self._tampon[..., :self._n_tampon],
+                                  autre._tampon[..., :autre._n_tampon]], axis=-1)
+        poids = np.concatenate([self._poids, autre._poids,
+                                np.ones(self._tampon.shape[:-1] + (self._n_tampon + autre._n_tampon,))], axis=-1)
+        self._centres, self._poids = self._compresser(valeurs, poids)
+        self._n_tampon = 0
+        return self
+
+    def moyenne(self):
+        """Moyenne par instant, tableau (n_temps, len(VARIABLES))."""
+        return self._moyenne.copy()
+
+    def variance(self, ddof=1):
+        """Variance par instant (non biaisée par défaut), tableau (n_temps, len(VARIABLES))."""
+        if self.n - ddof <= 0:
+            return np.full_like(self._m2, np.nan)
+        return self._m2 / (self.n - ddof)
+
+    def quantiles(self, q):
+        """Quantiles approchés par instant.
+
+        - `q`: niveau ou liste de niveaux dans [0, 1]
+
+        Retourne un tableau (len(q), n_temps, len(VARIABLES)), ou (n_temps, len(VARIABLES))
+        si `q` est un scalaire.
+        """
+        if self.n == 0:
+            raise ValueError("Aucune trajectoire agrégée")
+        niveaux = np.atleast_1d(np.asarray(q, dtype=float))
+        if np.any((niveaux < 0) | (niveaux > 1)):
+            raise ValueError("Les niveaux de quantile doivent être dans [0, 1]")
+        if self._n_tampon:
+            self._vider_tampon()
+
+        # Centroïdes non vides en tête (ordre conservé), centroïdes vides ramenés au maximum
+        ordre = np.argsort(self._poids == 0, axis=-1, kind='stable')
+        centres = np.take_along_axis(self._centres, ordre, axis=-1)
+        poids = np.take_along_axis(self._poids, ordre, axis=-1)
+        total = poids.sum(axis=-1, keepdims=True)
+        positions = np.cumsum(poids, axis=-1) - poids / 2
+        vide = poids == 0
+        centres = np.where(vide, self._max[..., None], centres)
+        positions = np.where(vide, total, positions)
+
+        xs = np.concatenate([self._min[..., None], centres, self._max[..., None]], axis=-1)
+        ps = np.concatenate([np.zeros_like(total), positions, total], axis=-1)
+
+        resultat = np.empty((len(niveaux),) + self._moyenne.shape)
+        for i, niveau in enumerate(niveaux):
+            cible = niveau * total
+            j = np.clip((ps < cible).sum(axis=-1, keepdims=True), 1, ps.shape[-1] - 1)
+            x0 = np.take_along_axis(xs, j - 1, axis=-1)
+            x1 = np.take_along_axis(xs, j, axis=-1)
+            p0 = np.take_along_axis(ps, j - 1, axis=-1)
+            p1 = np.take_along_axis(ps, j, axis=-1)
+            ecart = p1 - p0
+            frac = np.where(ecart > 0, (cible - p0) / np.where(ecart > 0, ecart, 1), 0.0)
+            resultat[i] = (x0 + frac * (x1 - x0))[..., 0]
+
+        return resultat[0] if np.ndim(q) == 0 else resultat
+
+    def resume(self, q=(0.05, 0.5, 0.95)):
+        """Résumé exportable en JSON : {'t', 'n', variable: {'moyenne', 'ecart_type', 'min', 'max', 'q5', ...}}."""
+        moyenne = self.moyenne()
+        ecart_type = np.sqrt(self.variance())
+        quantiles = self.quantiles(list(q))
+        resume = {"t": self.t.tolist(), "n": self.n}
+        for j, nom in enumerate(VARIABLES):
+            entree = {
+                "moyenne": moyenne[:, j].tolist(),
+                "ecart_type": ecart_type[:, j].tolist(),
+                "min": self._min[:, j].tolist(),
+                "max": self._max[:, j].tolist(),
+            }
+            for niveau, valeurs in zip(q, quantiles):
+                entree[f"q{niveau * 100:g}"] = valeurs[:, j].tolist()
+            resume[nom] = entree
+        return resume
+
+    def _fusionner_moments(self, n_b, moyenne_b, m2_b):
+        """Fusion de Chan et al. des moments (n, moyenne, M2)."""
+        n_a = self.n
+        n = n_a + n_b
+        delta = moyenne_b - self._moyenne
+        self._moyenne += delta * (n_b / n)
+        self._m2 += m2_b + delta ** 2 * (n_a * n_b / n)
+        self.n = n
+
+    def _vider_tampon(self):
+        """Compresse le tampon de valeurs brutes dans les centroïdes."""
+        valeurs = np.concatenate([self._centres, self._tampon[..., :self._n_tampon]], axis=-1)
+        poids = np.concatenate([self._poids, np.ones(self._tampon.shape[:-1] + (self._n_tampon,))], axis=-1)
+        self._centres, self._poids = self._compresser(valeurs, poids)
+        self._n_tampon = 0
+
+    def _compresser(self, valeurs, poids):
+        """Réduit des points pondérés à `n_centroides` centroïdes par cellule (instant, variable).
+
+        Les points triés sont regroupés selon l'échelle k(q) = asin(2q - 1) / pi + 1/2,
+        plus fine dans les queues de distribution, comme dans le t-digest.
+        """
+        m = self.n_centroides
+        ordre = np.argsort(valeurs, axis=-1)
+        valeurs = np.take_along_axis(valeurs, ordre, axis=-1)
+        poids = np.take_along_axis(poids, ordre, axis=-1)
+
+        total = poids.sum(axis=-1, keepdims=True)
+        q = (np.cumsum(poids, axis=-1) - poids / 2) / np.where(total > 0, total, 1)
+        k = np.arcsin(np.clip(2 * q - 1, -1, 1)) / np.pi + 0.5
+        bacs = np.minimum((k * m).astype(np.intp), m - 1)
+
+        n_cellules = bacs.size // bacs.shape[-1]
+        index = (np.arange(n_cellules).reshape(bacs.shape[:-1] + (1,)) * m + bacs).ravel()
+        somme_poids = np.bincount(index, weights=poids.ravel(), minlength=n_cellules * m)
+        somme_valeurs = np.bincount(index, weights=(valeurs * poids).ravel(), minlength=n_cellules * m)
+
+        forme = valeurs.shape[:-1] + (m,)
+        somme_poids = somme_poids.reshape(forme)
+        somme_valeurs = somme_valeurs.reshape(forme)
+        centres = np.where(somme_poids > 0, somme_valeurs / np.where(somme_poids > 0, somme_poids, 1), 0.0)
+        return centres, somme_poids
+
+
+def fusionner_agregateurs(agregateurs):
+    """Fusionne une liste d'agrégateurs (par exemple issus de processus différents) en un seul."""
+    agregateurs = list(agregateurs)
+    if not agregateurs:
+        raise ValueError("Aucun agrégateur à fusionner")
+    premier = agregateurs[0]
+    resultat = AgregateurEnsemble(premier.t, premier.n_centroides, premier.taille_tampon)
+    for agg in agregateurs:
+        resultat.fusionner(agg)
+    return resultat
+
+
+__all__ = ['AgregateurEnsemble', 'fusionner_agregateurs']
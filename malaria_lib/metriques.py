@@ -0,0 +1,189 @@
+"""
+Indicateurs de synthèse pour de grandes collections de scénarios
+Calcul vectorisé et table en colonnes filtrable et triable
+"""
+
+import csv
+
+import numpy as np
+
+from simulation import LotParametres, Parametres
+
+
+# Indicateurs calculés pour chaque scénario
+INDICATEURS = ('pic_prevalence', 'temps_pic', 'aire_infectes', 'couverture_finale', 'deces_paludisme')
+
+
+def _colonnes_parametres(parametres, n_runs):
+    """Normalise les paramètres des scénarios en dict {nom: tableau (n_runs,)}.
+
+    - `parametres`: None (valeurs par défaut), dict {nom: valeur(s)}, `LotParametres`,
+      liste d'instances de `Parametres`, ou tableau (n_runs, 17) dans l'ordre de `Parametres.CHAMPS`
+    """
+    noms = Parametres.CHAMPS
+    if parametres is None:
+        parametres = {}
+    if isinstance(parametres, dict):
+        inconnus = sorted(set(parametres) - set(noms))
+        if inconnus:
+            raise ValueError(f"Paramètres inconnus : {inconnus}")
+        # Les paramètres absents prennent la valeur par défaut de `Parametres`
+        valeurs = dict(zip(noms, Parametres.DEFAUTS))
+        valeurs.update(parametres)
+        colonnes = {nom: np.broadcast_to(np.asarray(v, dtype=float), (n_runs,)) for nom, v in valeurs.items()}
+    else:
+        if isinstance(parametres, LotParametres):
+            tableau = parametres.valeurs
+        elif len(parametres) and isinstance(parametres[0], Parametres):
+            tableau = LotParametres.depuis_liste(parametres).valeurs
+        else:
+            tableau = np.asarray(parametres, dtype=float)
+        if tableau.ndim != 2 or tableau.shape[1] != len(noms):
+            raise ValueError(f"Tableau de paramètres de forme {tableau.shape} : ({n_runs}, {len(noms)}) attendu")
+        colonnes = {nom: tableau[:, i] for i, nom in enumerate(noms)}
+    for nom, valeurs in colonnes.items():
+        if len(valeurs) != n_runs:
+            raise ValueError(f"Paramètre '{nom}' : {len(valeurs)} valeurs pour {n_runs} scénarios")
+    return colonnes
+
+
+def calculer_indicateurs_lot(trajectoires, t, d):
+    """Calcule les indicateurs de synthèse d'un lot de trajectoires en passes vectorisées.
+
+    - `trajectoires`: tableau (n_runs, n_temps, 9), compartiments dans l'ordre de `COMPARTIMENTS`
+    - `t`: instants (n_temps,)
+    - `d`: mortalité due au paludisme, scalaire ou tableau (n_runs,)
+
+    Retourne un dict {indicateur: tableau (n_runs,)} pour chaque nom de `INDICATEURS`.
+    Les décès sont l'intégrale de d * I_total sur la simulation.
+    """
+    y = np.asarray(trajectoires, dtype=float)
+    t = np.asarray(t, dtype=float)
+    if y.ndim != 3 or y.shape[1] != len(t) or y.shape[2] < 9:
+        raise ValueError(f"Trajectoires de forme {y.shape} : (n_runs, {len(t)}, 9) attendu")
+
+    S_total = y[:, :, 0] + y[:, :, 3] + y[:, :, 6]
+    V_total = y[:, :, 1] + y[:, :, 4] + y[:, :, 7]
+    I_total = y[:, :, 2] + y[:, :, 5] + y[:, :, 8]
+    N_total = S_total + V_total + I_total
+    prevalence = I_total / N_total
+
+    i_pic = np.argmax(prevalence, axis=1)
+    pic = np.take_along_axis(prevalence, i_pic[:, None], axis=1)[:, 0]
+    aire = ((I_total[:, 1:] + I_total[:, :-1]) * (np.diff(t) / 2)).sum(axis=1)
+
+    return {
+        'pic_prevalence': pic,
+        'temps_pic': t[i_pic],
+        'aire_infectes': aire,
+        'couverture_finale': V_total[:, -1] / N_total[:, -1],
+        'deces_paludisme': np.asarray(d, dtype=float) * aire,
+    }
+
+
+def tableau_indicateurs(trajectoires, t, parametres=None, taille_bloc=10000):
+    """Construit la table des indicateurs jointe aux paramètres des scénarios.
+
+    - `trajectoires`: tableau (n_runs, n_temps, 9), éventuellement un `np.memmap`
+    - `t`: instants (n_temps,)
+    - `parametres`: paramètres des scénarios (voir `_colonnes_parametres`)
+    - `taille_bloc`: nombre de scénarios traités par passe, pour borner la mémoire
+
+    Exemple d'utilisation :
+    >>> table = tableau_indicateurs(trajectoires, t, liste_params)
+    >>> pires = table.filtrer(couverture_finale=(None, 0.2)).classer('pic_prevalence', decroissant=True, n=10)
+    """
+    n_runs = len(trajectoires)
+    colonnes = {'scenario': np.arange(n_runs)}
+    colonnes.update(_colonnes_parametres(parametres, n_runs))
+    d = colonnes['d']
+
+    resultats = {nom: np.empty(n_runs) for nom in INDICATEURS}
+    for debut in range(0, n_runs, taille_bloc):
+        fin = min(n_runs, debut + taille_bloc)
+        bloc = calculer_indicateurs_lot(trajectoires[debut:fin], t, d[debut:fin])
+        for nom in INDICATEURS:
+            resultats[nom][debut:fin] = bloc[nom]
+    colonnes.update(resultats)
+    return TableScenarios(colonnes)
+
+
+class TableScenarios:
+    """Table en colonnes (dict de tableaux numpy de même longueur).
+
+    Les filtres et classements travaillent sur des masques et des index vectorisés,
+    sans boucle Python sur les lignes.
+    """
+
+    def __init__(self, colonnes):
+        colonnes = {nom: np.asarray(v) for nom, v in colonnes.items()}
+        longueurs = {len(v) for v in colonnes.values()}
+        if len(longueurs) > 1:
+            raise ValueError(f"Colonnes de longueurs différentes : {sorted(longueurs)}")
+        self.colonnes = colonnes
+
+    def __len__(self):
+        return len(next(iter(self.colonnes.values()))) if self.colonnes else 0
+
+    def __getitem__(self, cle):
+        """`table['nom']` renvoie une colonne ; un entier renvoie la ligne sous forme de dict
+        {colonne: valeur} ; une tranche, un masque ou un tableau d'index renvoie une sous-table."""
+        if isinstance(cle, str):
+            return self.colonnes[cle]
+        if isinstance(cle, (int, np.integer)):
+            return {nom: v[cle].item() for nom, v in self.colonnes.items()}
+        return TableScenarios({nom: v[cle] for nom, v in self.colonnes.items()})
+
+    def __repr__(self):
+        return f"TableScenarios({len(self)} lignes, colonnes={list(self.colonnes)})"
+
+    @property
+    def noms(self):
+        return list(self.colonnes)
+
+    def filtrer(self, masque=None, **bornes):
+        """Sélectionne les lignes vérifiant toutes les conditions.
+
+        - `masque`: tableau booléen optionnel
+        - `bornes`: `nom=(min, max)` (bornes incluses, None pour ignorer) ou `nom=valeur` pour l'égalité
+
+        >>> table.filtrer(pic_prevalence=(0.1, None), beta=0.5)
+        """
+        garde = np.ones(len(self), dtype=bool) if masque is None else np.asarray(masque, dtype=bool).copy()
+        for nom, condition in bornes.items():
+            valeurs = self.colonnes[nom]
+            if isinstance(condition, tuple):
+                minv, maxv = condition
+                if minv is not None:
+                    garde &= valeurs >= minv
+                if maxv is not None:
+                    garde &= valeurs <= maxv
+            else:
+                garde &= valeurs == condition
+        return self[garde]
+
+    def classer(self, colonne, decroissant=False, n=None):
+        """Trie selon `colonne` ; si `n` est donné, ne garde que les `n` premières lignes
+        (sélection partielle en O(n_lignes) avant le tri)."""
+        valeurs = self.colonnes[colonne]
+        cles = -valeurs if decroissant else valeurs
+        if n is not None and n < len(self):
+            candidats = np.argpartition(cles, n)[:n]
+            index = candidats[np.argsort(cles[candidats], kind='stable')]
+        else:
+            index = np.argsort(cles, kind='stable')
+        return self[index]
+
+    def vers_dict(self):
+        """Convertit la table en dict de listes (exportable en JSON)."""
+        return {nom: v.tolist() for nom, v in self.colonnes.items()}
+
+    def exporter_csv(self, csv_path):
+        """Écrit la table dans un fichier CSV (une ligne d'en-tête puis une ligne par scénario)."""
+        with open(csv_path, 'w', newline='', encoding='utf-8') as fcsv:
+            writer = csv.writer(fcsv)
+            writer.writerow(self.noms)
+            writer.writerows(zip(*(v.tolist() for v in self.colonnes.values())))
+
+
+__all__ = ['INDICATEURS', 'calculer_indicateurs_lot', 'tableau_indicateurs', 'TableScenarios']
@@ -0,0 +1,328 @@
+"""
+Spécification déclarative du modèle compartimental
+Compilation en second membre (RHS), jacobien et motif de creux sur tableaux plats
+"""
+
+import ast
+import hashlib
+import json
+import keyword
+
+import numpy as np
+from scipy.integrate import solve_ivp
+
+from simulation import LotParametres, Parametres
+
+
+def _specification_groupe1():
+    """Spécification équivalente à `systeme_equations` (Groupe 1, trois phases)."""
+    flux = []
+    for j in (1, 2, 3):
+        suivant = j % 3 + 1
+        S, V, I = f'S1{j}', f'V1{j}', f'I1{j}'
+        flux += [
+            # Apports constants
+            {'de': None, 'vers': S, 'taux': '10'},
+            {'de': None, 'vers': V, 'taux': '5'},
+            {'de': None, 'vers': I, 'taux': '1'},
+            # Mortalité naturelle et due au paludisme
+            {'de': S, 'vers': None, 'taux': 'mu'},
+            {'de': V, 'vers': None, 'taux': 'mu'},
+            {'de': I, 'vers': None, 'taux': 'd + mu'},
+            # Infection, guérison, perte d'immunité
+            {'de': S, 'vers': I, 'taux': f'lambda{j}'},
+            {'de': I, 'vers': S, 'taux': 'delta'},
+            {'de': V, 'vers': S, 'taux': 'omega'},
+            # Passage à la phase suivante
+            {'de': S, 'vers': f'S1{suivant}', 'taux': f'alpha_{j}'},
+            {'de': V, 'vers': f'V1{suivant}', 'taux': f'alpha_{j}'},
+            {'de': I, 'vers': f'I1{suivant}', 'taux': f'alpha_{j}'},
+            # Vaccination : dans `systeme_equations`, theta * S alimente V sans être retiré de S
+            {'de': None, 'vers': V, 'taux': f'theta_{j}', 'facteur': S, 'ouvert': True},
+        ]
+    return {
+        'compartiments': ['S11', 'V11', 'I11', 'S12', 'V12', 'I12', 'S13', 'V13', 'I13'],
+        'constantes': {'Nv': 50000, 'Iv': 5000},
+        'taux': {f'lambda{j}': f'beta * b_{j} * c * Iv / Nv' for j in (1, 2, 3)},
+        'flux': flux,
+    }
+
+
+# Modèle de référence, identique aux équations écrites à la main dans `simulation.py`
+MODELE_GROUPE1 = _specification_groupe1()
+
+_OPERATEURS = {ast.Add: '+', ast.Sub: '-', ast.Mult: '*', ast.Div: '/', ast.Pow: '**'}
+_OPERATEURS_UNAIRES = {ast.USub: '-', ast.UAdd: '+'}
+
+# Modèles déjà compilés, indexés par l'empreinte de leur spécification
+_CACHE = {}
+
+
+def vecteur_parametres(params):
+    """Convertit des paramètres en vecteur plat dans l'ordre de `Parametres.CHAMPS`.
+
+    - `params`: instance de `Parametres` (vue, sans copie), dict {nom: valeur} (complété
+      par les valeurs par défaut) ou séquence déjà ordonnée
+    """
+    if isinstance(params, Parametres):
+        return params.vers_vecteur()
+    if isinstance(params, dict):
+        return Parametres(**params).vers_vecteur()
+    return Parametres(params).vers_vecteur()
+
+
+def _empreinte(spec):
+    """Empreinte stable d'une spécification (clé du cache)."""
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _traduire(expression, noms_parametres, constantes, taux_connus, contexte):
+    """Traduit une expression de taux en code Python sur le vecteur `p`.
+
+    Les paramètres deviennent `p[i]`, les constantes sont inlinées et les taux
+    dérivés renvoient à leur variable locale `r_<nom>`.
+    """
+    try:
+        arbre = ast.parse(str(expression), mode='eval').body
+    except SyntaxError as e:
+        raise ValueError(f"{contexte} : expression invalide {expression!r} ({e.msg})")
+
+    def emettre(noeud):
+        if isinstance(noeud, ast.Constant) and isinstance(noeud.value, (int, float)):
+            return repr(float(noeud.value))
+        if isinstance(noeud, ast.Name):
+            nom = noeud.id
+            if nom in taux_connus:
+                return f'r_{nom}'
+            if nom in constantes:
+                return repr(float(constantes[nom]))
+            if nom in noms_parametres:
+                return f'p[{noms_parametres.index(nom)}]'
+            raise ValueError(f"{contexte} : nom inconnu '{nom}' dans {expression!r}")
+        if isinstance(noeud, ast.BinOp) and type(noeud.op) in _OPERATEURS:
+            return f'({emettre(noeud.left)} {_OPERATEURS[type(noeud.op)]} {emettre(noeud.right)})'
+        if isinstance(noeud, ast.UnaryOp) and type(noeud.op) in _OPERATEURS_UNAIRES:
+            return f'({_OPERATEURS_UNAIRES[type(noeud.op)]}{emettre(noeud.operand)})'
+        raise ValueError(f"{contexte} : construction non supportée dans {expression!r}")
+
+    return emettre(arbre)
+
+
+class ModeleCompile:
+    """Modèle compilé à partir d'une spécification déclarative.
+
+    Attributs principaux :
+    - `compartiments`, `noms_parametres` : ordre des vecteurs d'état et de paramètres
+    - `stoechiometrie` : matrice (n_compartiments, n_flux) des coefficients +1 / -1
+    - `bilan` : pour chaque compartiment, indices des flux d'apport, de sortie et des flux
+      ouverts (non conservatifs) échangés avec l'extérieur
+    - `sparsite` : motif booléen du jacobien, utilisable comme `jac_sparsity`
+    - `source` : code Python généré
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.compartiments = list(spec['compartiments'])
+        self.noms_parametres = list(Parametres.CHAMPS)
+        n = len(self.compartiments)
+        if len(set(self.compartiments)) != n:
+            raise ValueError("Compartiments en double dans la spécification")
+        index = {nom: i for i, nom in enumerate(self.compartiments)}
+
+        constantes = dict(spec.get('constantes', {}))
+        for nom in constantes:
+            if nom in index or nom in self.noms_parametres:
+                raise ValueError(f"Constante '{nom}' en conflit avec un compartiment ou un paramètre")
+
+        # Taux dérivés, dans l'ordre de déclaration
+        lignes_taux = []
+        taux_connus = set()
+        for nom, expression in spec.get('taux', {}).items():
+            if not isinstance(nom, str) or not nom.isidentifier() or keyword.iskeyword(nom):
+                raise ValueError(f"Taux '{nom}' : nom invalide (identifiant Python attendu)")
+            if nom in index or nom in self.noms_parametres or nom in constantes:
+                raise ValueError(f"Taux '{nom}' en conflit avec un compartiment, un paramètre ou une constante")
+            code = _traduire(expression, self.noms_parametres, constantes, taux_connus, f"Taux '{nom}'")
+            lignes_taux.append(f'    r_{nom} = {code}')
+            taux_connus.add(nom)
+
+        # Flux : valeur = taux * y[facteur], ou taux seul pour un apport constant
+        self.flux = list(spec['flux'])
+        self.stoechiometrie = np.zeros((n, len(self.flux)))
+        self.sparsite = np.eye(n, dtype=bool)
+        expressions_taux = {}
+        lignes_k = []
+        termes = [[] for _ in range(n)]
+        jacobien = {}
+        constants = {}
+        for f, flux in enumerate(self.flux):
+            contexte = f"Flux {f} ({flux.get('de')} -> {flux.get('vers')})"
+            de, vers = flux.get('de'), flux.get('vers')
+            facteur = flux.get('facteur', de)
+            for nom in (de, vers, facteur):
+                if nom is not None and nom not in index:
+                    raise ValueError(f"{contexte} : compartiment inconnu '{nom}'")
+            if de is None and vers is None:
+                raise ValueError(f"{contexte} : ni origine ni destination")
+            if de is not None and de == vers:
+                raise ValueError(f"{contexte} : origine et destination identiques")
+            # Bilan : un flux proportionnel à un compartiment qui n'en est pas l'origine
+            # crée ou détruit de la population ; il doit être déclaré explicitement
+            if facteur is not None and facteur != de and not flux.get('ouvert', False):
+                raise ValueError(f"{contexte} : non conservatif (proportionnel à '{facteur}' "
+                                 f"sans en être retiré), déclarer 'ouvert': True si voulu")
+
+            code = _traduire(flux['taux'], self.noms_parametres, constantes, taux_connus, contexte)
+            if code not in expressions_taux:
+                expressions_taux[code] = f'k{len(expressions_taux)}'
+                lignes_k.append(f'    {expressions_taux[code]} = {code}')
+            k = expressions_taux[code]
+            valeur = k if facteur is None else f'{k} * y{index[facteur]}'
+
+            if de is not None:
+                self.stoechiometrie[index[de], f] -= 1
+                termes[index[de]].append(f'- {valeur}')
+            if vers is not None:
+                self.stoechiometrie[index[vers], f] += 1
+                termes[index[vers]].append(f'+ {valeur}')
+            for cible, signe in ((de, '-'), (vers, '+')):
+                if cible is None:
+                    continue
+                if facteur is None:
+                    constants.setdefault(index[cible], []).append(f'{signe} {k}')
+                else:
+                    jacobien.setdefault((index[cible], index[facteur]), []).append(f'{signe} {k}')
+                    self.sparsite[index[cible], index[facteur]] = True
+
+        # Bilan par compartiment des échanges avec l'extérieur (les flux internes
+        # se compensent par construction : -1 à l'origine, +1 à la destination)
+        self.flux_externes = [f for f, flux in enumerate(self.flux)
+                              if flux.get('de') is None or flux.get('vers') is None]
+        self.bilan = {nom: {'apports': [], 'sorties': [], 'ouverts': []} for nom in self.compartiments}
+        for f in self.flux_externes:
+            flux = self.flux[f]
+            if flux.get('vers') is None:
+                self.bilan[flux['de']]['sorties'].append(f)
+            elif flux.get('facteur') is not None:
+                self.bilan[flux['vers']]['ouverts'].append(f)
+            else:
+                self.bilan[flux['vers']]['apports'].append(f)
+
+        self.source = self._generer(n, lignes_taux, lignes_k, termes, jacobien, constants)
+        espace = {'_empty': np.empty, '_zeros': np.zeros}
+        exec(compile(self.source, f'<modele {_empreinte(spec)[:12]}>', 'exec'), espace)
+        self._fabrique = espace['fabrique']
+
+    def _generer(self, n, lignes_taux, lignes_k, termes, jacobien, constants):
+        """Produit le code source de `fabrique(p, lot) -> (rhs, jac)`.
+
+        Tous les taux ne dépendent que des paramètres : le système est linéaire et,
+        pour un seul scénario, `rhs(t, y) = J @ y + b` avec J et b calculés une fois.
+        Pour un lot (`lot=True`, p de forme (n_parametres, k)), le second membre est
+        développé flux par flux sur un état de forme (n, k).
+        """
+        lignes = ['def fabrique(p, lot=False):']
+        lignes += lignes_taux + lignes_k
+        lignes.append('    if not lot:')
+        lignes.append('        J = _zeros((%d, %d))' % (n, n))
+        for (i, j), contributions in sorted(jacobien.items()):
+            lignes.append(f"        J[{i}, {j}] = {' '.join(contributions)}")
+        lignes.append('        b = _zeros(%d)' % n)
+        for i, contributions in sorted(constants.items()):
+            lignes.append(f"        b[{i}] = {' '.join(contributions)}")
+        lignes.append('        produit = J.dot')
+        lignes.append('')
+        lignes.append('        def rhs(t, y):')
+        lignes.append('            return produit(y) + b')
+        lignes.append('')
+        lignes.append('        def jac(t, y):')
+        lignes.append('            return J')
+        lignes.append('')
+        lignes.append('        return rhs, jac')
+        lignes.append('')
+        lignes.append('    def rhs_lot(t, y):')
+        for i in range(n):
+            lignes.append(f'        y{i} = y[{i}]')
+        lignes.append('        dy = _empty(y.shape)')
+        for i in range(n):
+            expression = ' '.join(termes[i]) if termes[i] else '0.0'
+            lignes.append(f'        dy[{i}] = 0.0 {expression}')
+        lignes.append('        return dy')
+        lignes.append('')
+        lignes.append('    return rhs_lot, None')
+        return '\n'.join(lignes) + '\n'
+
+    def fonctions(self, params):
+        """Renvoie `(rhs, jac)` liés aux paramètres.
+
+        - `params`: instance de `Parametres`, dict ou vecteur plat (voir `vecteur_parametres`).
+          Un `LotParametres` de k scénarios ou un tableau (n_parametres, k) donne un `rhs`
+          vectorisé (état de forme (n_compartiments, k)) ; le jacobien n'est alors pas défini.
+        """
+        if isinstance(params, LotParametres):
+            params = params.valeurs.T
+        if np.ndim(params) == 2:
+            p = np.asarray(params, dtype=float)
+            if p.shape[0] != len(self.noms_parametres):
+                raise ValueError(f"Tableau de paramètres de forme {p.shape} : ({len(self.noms_parametres)}, k) attendu")
+            return self._fabrique(tuple(p), lot=True)
+        return self._fabrique(tuple(vecteur_parametres(params).tolist()))
+
+    def resoudre(self, params, y0, t_span, t_eval=None, method='LSODA', **options):
+        """Résout le modèle avec `solve_ivp` en fournissant jacobien ou motif de creux.
+
+        Pour un seul scénario, le jacobien exact est passé aux méthodes implicites.
+        Pour un lot de k scénarios (voir `fonctions`), l'état (n_compartiments, k) est
+        aplati pour le solveur, `y0` de forme (n_compartiments,) est répété pour chaque
+        scénario, le motif de creux par blocs est passé en `jac_sparsity` à Radau et BDF,
+        et `sol.y` est rendu de forme (n_compartiments, k, n_temps).
+        """
+        rhs, jac = self.fonctions(params)
+        y0 = np.asarray(y0, dtype=float)
+        if jac is not None:
+            if method in ('Radau', 'BDF', 'LSODA'):
+                options.setdefault('jac', jac)
+            return solve_ivp(rhs, t_span, y0, t_eval=t_eval, method=method, **options)
+
+        n = len(self.compartiments)
+        k = len(params) if isinstance(params, LotParametres) else np.shape(params)[1]
+        if y0.ndim == 1:
+            y0 = np.repeat(y0[:, None], k, axis=1)
+        if y0.shape != (n, k):
+            raise ValueError(f"y0 de forme {y0.shape} : ({n},) ou ({n}, {k}) attendu")
+        if method in ('Radau', 'BDF'):
+            options.setdefault('jac_sparsity', np.kron(self.sparsite, np.eye(k, dtype=bool)))
+        sol = solve_ivp(lambda t, y: rhs(t, y.reshape(n, k)).ravel(), t_span, y0.ravel(),
+                        t_eval=t_eval, method=method, **options)
+        sol.y = sol.y.reshape(n, k, -1)
+        return sol
+
+
+def compiler(spec=None):
+    """Compile une spécification (par défaut `MODELE_GROUPE1`), avec mise en cache.
+
+    Une spécification est un dict :
+    - `compartiments`: liste ordonnée des noms de compartiments
+    - `constantes`: dict {nom: valeur} (optionnel)
+    - `taux`: dict {nom: expression} de taux dérivés, évalués dans l'ordre (optionnel)
+    - `flux`: liste de dicts {'de', 'vers', 'taux', 'facteur', 'ouvert'} ; `de` ou `vers`
+      à None pour un échange avec l'extérieur, `facteur` (par défaut `de`) le compartiment
+      multipliant le taux, `ouvert` pour autoriser un flux non conservatif
+
+    Les expressions ne peuvent utiliser que des paramètres de `Parametres`, des constantes,
+    des taux dérivés et les opérateurs + - * / **.
+
+    Validation à la compilation : noms de compartiments, paramètres et constantes connus,
+    flux ayant une origine ou une destination distinctes, et refus de tout flux
+    proportionnel à un compartiment dont il n'est pas retiré (création de population)
+    sauf s'il est déclaré `ouvert`. Les flux internes étant retirés de leur origine et
+    ajoutés à leur destination, seuls les flux listés dans `bilan` modifient l'effectif total.
+    """
+    spec = MODELE_GROUPE1 if spec is None else spec
+    cle = _empreinte(spec)
+    if cle not in _CACHE:
+        _CACHE[cle] = ModeleCompile(spec)
+    return _CACHE[cle]
+
+
+__all__ = ['MODELE_GROUPE1', 'ModeleCompile', 'compiler', 'vecteur_parametres']
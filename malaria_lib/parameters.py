@@ -30,7 +30,7 @@ def charger_parametres_csv(csv_path: str, as_instance: bool = True, validate: bo
 	- deux colonnes sans en-tête : première colonne = nom, seconde = valeur
 
 	Si `as_instance=True`, la fonction importera `simulation.Parametres`, créera une instance
-	et assignera les attributs trouvés. Sinon elle renverra un dictionnaire.
+	et surchargera en bloc les champs trouvés. Sinon elle renverra un dictionnaire.
 
 	Exemple d'utilisation :
 	>>> params = load_parameters_from_csv('params.csv')
@@ -82,23 +82,24 @@ def charger_parametres_csv(csv_path: str, as_instance: bool = True, validate: bo
 			import simulation
 
 			inst = simulation.Parametres()
+			champs = simulation.Parametres.CHAMPS
+			trouves = {}
 			for k, v in params.items():
-				# adapter quelques noms fréquents (facultatif)
+				# adapter quelques noms fréquents : tirets ou espaces remplacés par underscore
 				key = k.strip()
-				if hasattr(inst, key):
-					setattr(inst, key, v)
-				else:
-					# remplacer tirets ou espaces par underscore
-					key2 = key.replace('-', '_').replace(' ', '_')
-					if hasattr(inst, key2):
-						setattr(inst, key2, v)
+				if key not in champs:
+					key = key.replace('-', '_').replace(' ', '_')
+				if key in champs:
+					trouves[key] = v
 			# validation optionnelle
 			if validate:
-				errors = validate_params_dict({attr: getattr(inst, attr) for attr in vars(inst)}, raise_on_error=raise_on_error)
+				errors = validate_params_dict({**inst.vers_dict(), **trouves}, raise_on_error=raise_on_error)
 				if errors and not raise_on_error:
 					print(" Erreurs de validation trouvées :")
 					for e in errors:
 						print(" - ", e)
+			# surcharge en bloc ; les valeurs non numériques sont ignorées
+			inst.remplacer(**{k: v for k, v in trouves.items() if isinstance(v, (int, float))})
 			return inst
 		except Exception as e:
 			# si on ne peut pas créer l'instance, renvoyer le dict
@@ -0,0 +1,332 @@
+"""
+Serveur local de simulations
+Regroupement des requêtes identiques, résolution par lots et cache de résultats
+"""
+
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError, as_completed
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from modele import compiler, vecteur_parametres
+from parameters import validate_params_dict
+from simulation import VARIABLES, calculer_indicateurs
+
+
+# Valeurs par défaut d'un job, identiques à `simulation_demo()`
+Y0_DEFAUT = [3000, 500, 100, 3000, 500, 100, 3000, 500, 100]
+JOB_DEFAUT = {'t_span': [0, 100], 'n_points': 200, 'method': 'RK45', 'rtol': 1e-6}
+
+
+def normaliser_job(job):
+    """Valide un job JSON et le met sous forme canonique.
+
+    Champs acceptés : `parametres` (dict de champs de `Parametres`, complété par les
+    valeurs par défaut), `y0`, `t_span`, `n_points` ou `t_eval`, `method`, `rtol`.
+    Lève ValueError si un champ est inconnu ou hors plage.
+    """
+    modele = compiler()
+    inconnus = set(job) - {'parametres', 'y0', 't_span', 'n_points', 't_eval', 'method', 'rtol'}
+    if inconnus:
+        raise ValueError(f"Champs de job inconnus : {sorted(inconnus)}")
+    parametres = job.get('parametres', {})
+    inconnus = set(parametres) - set(modele.noms_parametres)
+    if inconnus:
+        raise ValueError(f"Paramètres inconnus : {sorted(inconnus)}")
+    validate_params_dict(parametres)
+
+    t_span = [float(x) for x in job.get('t_span', JOB_DEFAUT['t_span'])]
+    if 't_eval' in job:
+        t_eval = [float(x) for x in job['t_eval']]
+    else:
+        t_eval = np.linspace(t_span[0], t_span[1], int(job.get('n_points', JOB_DEFAUT['n_points']))).tolist()
+    y0 = [float(x) for x in job.get('y0', Y0_DEFAUT)]
+    if len(y0) != len(modele.compartiments):
+        raise ValueError(f"y0 : {len(modele.compartiments)} valeurs attendues")
+
+    return {
+        'parametres': vecteur_parametres(parametres).tolist(),
+        'y0': y0,
+        't_span': t_span,
+        't_eval': t_eval,
+        'method': str(job.get('method', JOB_DEFAUT['method'])),
+        'rtol': float(job.get('rtol', JOB_DEFAUT['rtol'])),
+    }
+
+
+def _cle(job):
+    return json.dumps(job, sort_keys=True)
+
+
+def _cle_lot(job):
+    """Deux jobs de même grille temporelle et mêmes réglages du solveur se résolvent ensemble."""
+    return _cle({k: job[k] for k in ('t_span', 't_eval', 'method', 'rtol')})
+
+
+class ServeurSimulation:
+    """Ordonnanceur de simulations partagé entre clients.
+
+    - les requêtes identiques déjà calculées sont servies depuis un cache LRU
+    - les requêtes identiques en cours de calcul partagent le même `Future`
+    - les requêtes compatibles arrivées dans une fenêtre de `fenetre` secondes sont
+      résolues en un seul appel à `solve_ivp` sur l'état empilé (9 * k variables)
+
+    Les jobs d'un lot partagent le contrôle du pas du solveur : un résultat dépend donc
+    des autres jobs du lot et n'est égal à celui d'une résolution isolée qu'à la
+    tolérance `rtol` près (le premier calculé est celui mis en cache). Si la résolution
+    d'un lot échoue, chaque job est résolu séparément pour que seuls les jobs fautifs
+    reçoivent l'erreur.
+
+    Une requête HTTP attend ses résultats au plus `delai_max` secondes. `fermer()` arrête
+    le fil de calcul après le lot en cours ; les jobs encore en file reçoivent une erreur.
+    """
+
+    def __init__(self, taille_cache=1024, taille_lot=64, fenetre=0.005, delai_max=60.0):
+        self.modele = compiler()
+        self.taille_cache = taille_cache
+        self.taille_lot = taille_lot
+        self.fenetre = fenetre
+        self.delai_max = delai_max
+        self._ferme = False
+        self._cache = OrderedDict()
+        self._en_cours = {}
+        self._verrou = threading.Lock()
+        self._file = queue.Queue()
+        self.statistiques = {'requetes': 0, 'cache': 0, 'regroupees': 0, 'calculees': 0, 'lots': 0}
+        self._travailleur = threading.Thread(target=self._boucle, daemon=True)
+        self._travailleur.start()
+
+    def soumettre(self, job):
+        """Soumet un job (dict JSON) et renvoie `(future, depuis_cache)`."""
+        job = normaliser_job(job)
+        cle = _cle(job)
+        with self._verrou:
+            if self._ferme:
+                raise RuntimeError("Serveur de simulation fermé")
+            self.statistiques['requetes'] += 1
+            if cle in self._cache:
+                self._cache.move_to_end(cle)
+                self.statistiques['cache'] += 1
+                future = Future()
+                future.set_result(self._cache[cle])
+                return future, True
+            if cle in self._en_cours:
+                self.statistiques['regroupees'] += 1
+                return self._en_cours[cle], False
+            future = Future()
+            self._en_cours[cle] = future
+            self._file.put((cle, job))
+        return future, False
+
+    def fermer(self, delai=None):
+        """Arrête le fil de calcul (attente d'au plus `delai` secondes) ; idempotent."""
+        with self._verrou:
+            if self._ferme:
+                return
+            self._ferme = True
+            self._file.put(None)
+        self._travailleur.join(delai)
+
+    def _boucle(self):
+        arret = False
+        while not arret:
+            attente = [self._file.get()]
+            limite = time.monotonic() + self.fenetre
+            while len(attente) < self.taille_lot:
+                reste = limite - time.monotonic()
+                if reste <= 0:
+                    break
+                try:
+                    attente.append(self._file.get(timeout=reste))
+                except queue.Empty:
+                    break
+            # `None` est la sentinelle déposée par `fermer()`, toujours en dernier dans la file
+            if attente[-1] is None:
+                attente.pop()
+                arret = True
+
+            lots = {}
+            for cle, job in attente:
+                lots.setdefault(_cle_lot(job), []).append((cle, job))
+            for lot in lots.values():
+                self._resoudre_lot(lot)
+
+        with self._verrou:
+            futures = list(self._en_cours.values())
+            self._en_cours.clear()
+        for future in futures:
+            future.set_exception(RuntimeError("Serveur de simulation fermé"))
+
+    def _resoudre_lot(self, lot):
+        cles = [cle for cle, _ in lot]
+        jobs = [job for _, job in lot]
+        try:
+            resultats = self._resoudre(jobs)
+        except Exception as e:
+            if len(jobs) == 1:
+                resultats = [e]
+            else:
+                resultats = []
+                for job in jobs:
+                    try:
+                        resultats.extend(self._resoudre([job]))
+                    except Exception as erreur:
+                        resultats.append(erreur)
+
+        with self._verrou:
+            self.statistiques['lots'] += 1
+            self.statistiques['calculees'] += len(jobs)
+            futures = [self._en_cours.pop(cle) for cle in cles]
+            for cle, resultat in zip(cles, resultats):
+                if not isinstance(resultat, Exception):
+                    self._cache[cle] = resultat
+                    self._cache.move_to_end(cle)
+            while len(self._cache) > self.taille_cache:
+                self._cache.popitem(last=False)
+        for future, resultat in zip(futures, resultats):
+            if isinstance(resultat, Exception):
+                future.set_exception(resultat)
+            else:
+                future.set_result(resultat)
+
+    def _resoudre(self, jobs):
+        """Résout k jobs compatibles en un seul système de 9 * k équations."""
+        k = len(jobs)
+        p = np.array([job['parametres'] for job in jobs]).T
+        y0 = np.array([job['y0'] for job in jobs]).T
+        reference = jobs[0]
+
+        sol = self.modele.resoudre(
+            p, y0,
+            t_span=reference['t_span'],
+            t_eval=reference['t_eval'],
+            method=reference['method'],
+            rtol=reference['rtol'],
+        )
+        if not sol.success:
+            raise RuntimeError(f"Échec de la simulation: {sol.message}")
+
+        valeurs = calculer_indicateurs(sol.y.transpose(1, 2, 0))
+        t = sol.t.tolist()
+        resultats = []
+        for i in range(k):
+            resultat = {'t': t}
+            resultat.update({nom: valeurs[i, :, j].tolist() for j, nom in enumerate(VARIABLES)})
+            resultats.append(resultat)
+        return resultats
+
+
+class _Gestionnaire(BaseHTTPRequestHandler):
+    """`POST /simuler` : un job ou {"jobs": [...]} ; réponse NDJSON, une ligne par job
+    dans l'ordre d'achèvement. `GET /etat` : statistiques du serveur."""
+
+    serveur_simulation = None
+
+    def _repondre_json(self, code, contenu):
+        corps = json.dumps(contenu).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(corps)))
+        self.end_headers()
+        self.wfile.write(corps)
+
+    def do_GET(self):
+        if self.path != '/etat':
+            self._repondre_json(404, {'erreur': f"Chemin inconnu: {self.path}"})
+            return
+        self._repondre_json(200, dict(self.serveur_simulation.statistiques))
+
+    def do_POST(self):
+        if self.path != '/simuler':
+            self._repondre_json(404, {'erreur': f"Chemin inconnu: {self.path}"})
+            return
+        try:
+            longueur = int(self.headers.get('Content-Length', 0))
+            demande = json.loads(self.rfile.read(longueur) or b'{}')
+            jobs = demande['jobs'] if 'jobs' in demande else [demande]
+            soumis = [self.serveur_simulation.soumettre(job) for job in jobs]
+        except (ValueError, KeyError, TypeError) as e:
+            self._repondre_json(400, {'erreur': str(e)})
+            return
+
+        # Envoi au fil de l'eau : connexion HTTP/1.0 fermée en fin de réponse
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.end_headers()
+        # Un même `Future` peut servir plusieurs jobs identiques de la requête
+        index = {}
+        for i, (future, _) in enumerate(soumis):
+            index.setdefault(future, []).append(i)
+        restants = set(index)
+        try:
+            for future in as_completed(index, timeout=self.serveur_simulation.delai_max):
+                restants.discard(future)
+                self._ecrire_lignes(future, index[future], soumis)
+        except TimeoutError:
+            # Les jobs non terminés dans le délai reçoivent une ligne d'erreur
+            for future in restants:
+                self._ecrire_lignes(future, index[future], soumis, erreur="Délai dépassé")
+
+    def _ecrire_lignes(self, future, indices, soumis, erreur=None):
+        for i in indices:
+            ligne = {'index': i, 'cache': soumis[i][1]}
+            if erreur is not None:
+                ligne['erreur'] = erreur
+            else:
+                try:
+                    ligne['resultat'] = future.result()
+                except Exception as e:
+                    ligne['erreur'] = str(e)
+            self.wfile.write(json.dumps(ligne).encode('utf-8') + b'\n')
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _ServeurHTTP(ThreadingHTTPServer):
+    """Serveur HTTP dont la fermeture arrête aussi le fil de calcul des simulations."""
+
+    def server_close(self):
+        super().server_close()
+        self.RequestHandlerClass.serveur_simulation.fermer()
+
+
+def creer_serveur(hote='127.0.0.1', port=8765, **options):
+    """Crée le serveur HTTP local (non démarré) ; `options` sont passées à `ServeurSimulation`."""
+    gestionnaire = type('Gestionnaire', (_Gestionnaire,), {'serveur_simulation': ServeurSimulation(**options)})
+    return _ServeurHTTP((hote, port), gestionnaire)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur local de simulations du paludisme")
+    parser.add_argument('--hote', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--taille-cache', type=int, default=1024)
+    parser.add_argument('--taille-lot', type=int, default=64)
+    parser.add_argument('--fenetre', type=float, default=0.005, help="fenêtre de regroupement (s)")
+    parser.add_argument('--delai-max', type=float, default=60.0, help="attente maximale d'une requête (s)")
+    args = parser.parse_args()
+
+    httpd = creer_serveur(args.hote, args.port, taille_cache=args.taille_cache,
+                          taille_lot=args.taille_lot, fenetre=args.fenetre, delai_max=args.delai_max)
+    print(f"✓ Serveur de simulation sur http://{args.hote}:{httpd.server_address[1]}")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+
+
+__all__ = ['ServeurSimulation', 'creer_serveur', 'normaliser_job']
+
+
+if __name__ == "__main__":
+    main()
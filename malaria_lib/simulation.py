@@ -10,41 +10,203 @@ import matplotlib.pyplot as plt
 import json
 import csv
 import os
+import hashlib
+
+# Paramètres du modèle : (nom, valeur par défaut) dans l'ordre canonique du vecteur plat
+_CHAMPS_DEFAUTS = (
+    # Paramètres démographiques
+    ('mu', 0.00004),     # Mortalité humaine
+    ('mu_v', 0.1),       # Mortalité moustiques
+    ('r', 0.1),          # Naissance moustiques
+    ('d', 0.005),        # Mortalité paludisme
+
+    # Paramètres épidémiologiques
+    ('delta', 0.05),     # Guérison
+    ('omega', 0.002),    # Perte immunité
+
+    # Vaccination
+    ('theta_1', 0.01),   # Matin
+    ('theta_2', 0.005),  # Soirée
+    ('theta_3', 0.001),  # Nuit
+
+    # Transitions
+    ('alpha_1', 3.0),
+    ('alpha_2', 3.0),
+    ('alpha_3', 3.0),
+
+    # Transmission
+    ('beta', 0.5),
+    ('c', 0.3),
+    ('b_1', 0.5),
+    ('b_2', 1.0),
+    ('b_3', 2.0),
+)
+
 
-# Paramètres du modèle
 class Parametres:
-    def __init__(self):
-        # Paramètres démographiques
-        self.mu = 0.00004    # Mortalité humaine
-        self.mu_v = 0.1      # Mortalité moustiques
-        self.r = 0.1         # Naissance moustiques
-        self.d = 0.005       # Mortalité paludisme
-        
-        # Paramètres épidémiologiques
-        self.delta = 0.05    # Guérison
-        self.omega = 0.002   # Perte immunité
-        
-        # Vaccination
-        self.theta_1 = 0.01  # Matin
-        self.theta_2 = 0.005 # Soirée
-        self.theta_3 = 0.001 # Nuit
-        
-        # Transitions
-        self.alpha_1 = 3.0
-        self.alpha_2 = 3.0
-        self.alpha_3 = 3.0
-        
-        # Transmission
-        self.beta = 0.5
-        self.c = 0.3
-        self.b_1 = 0.5
-        self.b_2 = 1.0
-        self.b_3 = 2.0
+    """Paramètres du modèle, stockés dans un vecteur numpy de 17 flottants.
+
+    Les champs (`params.beta`, ...) se lisent et s'écrivent comme des attributs ;
+    `CHAMPS` donne l'ordre canonique du vecteur. Une instance peut être une vue sur
+    une ligne d'un tableau 2-D (voir `LotParametres`) : aucune copie n'est faite.
+
+    Une instance est modifiable, donc non hachable : pour indexer un cache ou un dict,
+    utiliser `cle()`, empreinte des valeurs au moment de l'appel.
+
+    Exemple d'utilisation :
+    >>> params = Parametres(beta=0.8)
+    >>> v = params.vers_vecteur()          # vue, sans copie
+    >>> autre = Parametres.depuis_vecteur(v)
+    """
+
+    __slots__ = ('_valeurs',)
+
+    CHAMPS = tuple(nom for nom, _ in _CHAMPS_DEFAUTS)
+    DEFAUTS = tuple(valeur for _, valeur in _CHAMPS_DEFAUTS)
+    INDEX = {nom: i for i, nom in enumerate(CHAMPS)}
+
+    def __init__(self, valeurs=None, **surcharges):
+        if valeurs is None:
+            valeurs = np.array(self.DEFAUTS)
+        else:
+            valeurs = np.asarray(valeurs, dtype=float)
+            if valeurs.shape != (len(self.CHAMPS),):
+                raise ValueError(f"Vecteur de forme {valeurs.shape} : ({len(self.CHAMPS)},) attendu")
+        self._valeurs = valeurs
+        if surcharges:
+            self.remplacer(**surcharges)
+
+    @classmethod
+    def depuis_vecteur(cls, vecteur):
+        """Instance adossée à `vecteur` (sans copie s'il est déjà en float64)."""
+        return cls(vecteur)
+
+    @classmethod
+    def depuis_dict(cls, valeurs):
+        """Instance aux valeurs par défaut, surchargées par le dict {nom: valeur}."""
+        return cls(**valeurs)
+
+    def vers_vecteur(self):
+        """Vecteur plat des paramètres dans l'ordre de `CHAMPS` (vue, sans copie)."""
+        return self._valeurs
+
+    def vers_dict(self):
+        return dict(zip(self.CHAMPS, self._valeurs.tolist()))
+
+    def remplacer(self, **valeurs):
+        """Surcharge plusieurs champs à la fois ; lève ValueError pour un nom inconnu."""
+        inconnus = [nom for nom in valeurs if nom not in self.INDEX]
+        if inconnus:
+            raise ValueError(f"Paramètres inconnus : {inconnus}")
+        index = [self.INDEX[nom] for nom in valeurs]
+        self._valeurs[index] = list(valeurs.values())
+        return self
+
+    def copie(self):
+        return Parametres(self._valeurs.copy())
+
+    def cle(self):
+        """Empreinte stable (identique d'un processus à l'autre), utilisable comme clé de cache."""
+        return hashlib.sha256((self._valeurs + 0.0).tobytes()).hexdigest()
+
+    # Égalité par valeur sur un objet modifiable : `cle()` sert de clé de cache
+    __hash__ = None
+
+    def __eq__(self, autre):
+        if not isinstance(autre, Parametres):
+            return NotImplemented
+        return np.array_equal(self._valeurs, autre._valeurs)
+
+    def __repr__(self):
+        return 'Parametres(' + ', '.join(f'{nom}={valeur!r}' for nom, valeur in self.vers_dict().items()) + ')'
+
+    def __getstate__(self):
+        return self._valeurs
+
+    def __setstate__(self, valeurs):
+        self._valeurs = valeurs
+
+
+def _champ(i, nom):
+    def lire(self):
+        return self._valeurs.item(i)
+
+    def ecrire(self, valeur):
+        self._valeurs[i] = valeur
+
+    return property(lire, ecrire, doc=f"Paramètre '{nom}' (indice {i} du vecteur)")
+
+
+for _i, _nom in enumerate(Parametres.CHAMPS):
+    setattr(Parametres, _nom, _champ(_i, _nom))
+
+
+class LotParametres:
+    """Ensemble de jeux de paramètres stockés dans un seul tableau (n, 17).
+
+    `lot[i]` renvoie une instance de `Parametres` adossée à la ligne i (vue, sans copie) ;
+    une tranche ou un masque renvoie un sous-lot.
+
+    Exemple d'utilisation :
+    >>> lot = LotParametres.repeter(1_000_000)
+    >>> lot.remplacer(beta=np.random.uniform(0.1, 1.0, len(lot)))
+    >>> lot[42].beta
+    """
+
+    __slots__ = ('valeurs',)
+
+    def __init__(self, valeurs):
+        valeurs = np.asarray(valeurs, dtype=float)
+        if valeurs.ndim != 2 or valeurs.shape[1] != len(Parametres.CHAMPS):
+            raise ValueError(f"Tableau de forme {valeurs.shape} : (n, {len(Parametres.CHAMPS)}) attendu")
+        self.valeurs = valeurs
+
+    @classmethod
+    def repeter(cls, n, params=None):
+        """Lot de `n` copies de `params` (par défaut les valeurs de `Parametres()`)."""
+        params = Parametres() if params is None else params
+        return cls(np.tile(params.vers_vecteur(), (n, 1)))
+
+    @classmethod
+    def depuis_liste(cls, liste):
+        return cls(np.array([p.vers_vecteur() for p in liste]))
+
+    def __len__(self):
+        return len(self.valeurs)
+
+    def __getitem__(self, cle):
+        if isinstance(cle, (int, np.integer)):
+            return Parametres(self.valeurs[cle])
+        return LotParametres(self.valeurs[cle])
+
+    def __iter__(self):
+        return (Parametres(ligne) for ligne in self.valeurs)
+
+    def colonne(self, nom):
+        """Valeurs du paramètre `nom` pour tout le lot (vue, sans copie)."""
+        return self.valeurs[:, Parametres.INDEX[nom]]
+
+    def remplacer(self, **colonnes):
+        """Surcharge des colonnes entières (scalaire ou tableau de longueur n par nom)."""
+        inconnus = [nom for nom in colonnes if nom not in Parametres.INDEX]
+        if inconnus:
+            raise ValueError(f"Paramètres inconnus : {inconnus}")
+        for nom, valeurs in colonnes.items():
+            self.valeurs[:, Parametres.INDEX[nom]] = valeurs
+        return self
+
 
 # Système d'équations simplifié (seulement Groupe 1)
 def systeme_equations(t, y, params):
-    """Système simplifié avec 9 équations (Groupe 1 seulement)"""
-    
+    """Système simplifié avec 9 équations (Groupe 1 seulement)
+
+    `params` : instance de `Parametres` ou vecteur plat dans l'ordre de `Parametres.CHAMPS`
+    """
+    # Lecture des paramètres en variables locales, une seule fois par appel
+    vecteur = params.vers_vecteur() if isinstance(params, Parametres) else np.asarray(params, dtype=float)
+    (mu, mu_v, r, d, delta, omega, theta_1, theta_2, theta_3,
+     alpha_1, alpha_2, alpha_3, beta, c, b_1, b_2, b_3) = vecteur.tolist()
+
     # Variables: S11, V11, I11, S12, V12, I12, S13, V13, I13
     S11, V11, I11, S12, V12, I12, S13, V13, I13 = y
     
@@ -53,41 +215,66 @@ def systeme_equations(t, y, params):
     Iv = 5000  # 10% infectés
     
     # Forces d'infection
-    lambda1 = params.beta * params.b_1 * params.c * Iv / Nv
-    lambda2 = params.beta * params.b_2 * params.c * Iv / Nv
-    lambda3 = params.beta * params.b_3 * params.c * Iv / Nv
+    lambda1 = beta * b_1 * c * Iv / Nv
+    lambda2 = beta * b_2 * c * Iv / Nv
+    lambda3 = beta * b_3 * c * Iv / Nv
     
     # Équations différentielles
-    dS11_dt = (10 + params.alpha_3 * S13 + params.omega * V11 + params.delta * I11) - \
-              (params.mu * S11 + params.alpha_1 * S11 + lambda1 * S11)
+    dS11_dt = (10 + alpha_3 * S13 + omega * V11 + delta * I11) - \
+              (mu * S11 + alpha_1 * S11 + lambda1 * S11)
     
-    dV11_dt = (params.theta_1 * S11 + params.alpha_3 * V13 + 5) - \
-              (params.mu * V11 + params.omega * V11 + params.alpha_1 * V11)
+    dV11_dt = (theta_1 * S11 + alpha_3 * V13 + 5) - \
+              (mu * V11 + omega * V11 + alpha_1 * V11)
     
-    dI11_dt = (lambda1 * S11 + params.alpha_3 * I13 + 1) - \
-              ((params.d + params.mu) * I11 + params.delta * I11 + params.alpha_1 * I11)
+    dI11_dt = (lambda1 * S11 + alpha_3 * I13 + 1) - \
+              ((d + mu) * I11 + delta * I11 + alpha_1 * I11)
     
-    dS12_dt = (10 + params.alpha_1 * S11 + params.omega * V12 + params.delta * I12) - \
-              (params.mu * S12 + params.alpha_2 * S12 + lambda2 * S12)
+    dS12_dt = (10 + alpha_1 * S11 + omega * V12 + delta * I12) - \
+              (mu * S12 + alpha_2 * S12 + lambda2 * S12)
     
-    dV12_dt = (params.theta_2 * S12 + params.alpha_1 * V11 + 5) - \
-              (params.mu * V12 + params.omega * V12 + params.alpha_2 * V12)
+    dV12_dt = (theta_2 * S12 + alpha_1 * V11 + 5) - \
+              (mu * V12 + omega * V12 + alpha_2 * V12)
     
-    dI12_dt = (lambda2 * S12 + params.alpha_1 * I11 + 1) - \
-              ((params.d + params.mu) * I12 + params.delta * I12 + params.alpha_2 * I12)
+    dI12_dt = (lambda2 * S12 + alpha_1 * I11 + 1) - \
+              ((d + mu) * I12 + delta * I12 + alpha_2 * I12)
     
-    dS13_dt = (10 + params.alpha_2 * S12 + params.omega * V13 + params.delta * I13) - \
-              (params.mu * S13 + params.alpha_3 * S13 + lambda3 * S13)
+    dS13_dt = (10 + alpha_2 * S12 + omega * V13 + delta * I13) - \
+              (mu * S13 + alpha_3 * S13 + lambda3 * S13)
     
-    dV13_dt = (params.theta_3 * S13 + params.alpha_2 * V12 + 5) - \
-              (params.mu * V13 + params.omega * V13 + params.alpha_3 * V13)
+    dV13_dt = (theta_3 * S13 + alpha_2 * V12 + 5) - \
+              (mu * V13 + omega * V13 + alpha_3 * V13)
     
-    dI13_dt = (lambda3 * S13 + params.alpha_2 * I12 + 1) - \
-              ((params.d + params.mu) * I13 + params.delta * I13 + params.alpha_3 * I13)
+    dI13_dt = (lambda3 * S13 + alpha_2 * I12 + 1) - \
+              ((d + mu) * I13 + delta * I13 + alpha_3 * I13)
     
-    return [dS11_dt, dV11_dt, dI11_dt, dS12_dt, dV12_dt, dI12_dt, 
+    return [dS11_dt, dV11_dt, dI11_dt, dS12_dt, dV12_dt, dI12_dt,
             dS13_dt, dV13_dt, dI13_dt]
 
+
+# Ordre des compartiments dans le vecteur d'état et des variables exportées
+COMPARTIMENTS = ('S11', 'V11', 'I11', 'S12', 'V12', 'I12', 'S13', 'V13', 'I13')
+VARIABLES = COMPARTIMENTS + ('S_total', 'V_total', 'I_total', 'N_total',
+                             'prevalence', 'couverture')
+
+
+def calculer_indicateurs(y):
+    """Calcule toutes les variables de `VARIABLES` à partir des compartiments.
+
+    - `y`: tableau de forme (..., 9), compartiments sur le dernier axe
+      (ordre de `COMPARTIMENTS`)
+
+    Retourne un tableau de forme (..., len(VARIABLES)).
+    """
+    y = np.asarray(y, dtype=float)
+    S_total = y[..., 0] + y[..., 3] + y[..., 6]
+    V_total = y[..., 1] + y[..., 4] + y[..., 7]
+    I_total = y[..., 2] + y[..., 5] + y[..., 8]
+    N_total = S_total + V_total + I_total
+    derivees = np.stack([S_total, V_total, I_total, N_total,
+                         I_total / N_total, V_total / N_total], axis=-1)
+    return np.concatenate([y, derivees], axis=-1)
+
+
 def simulation_demo():
     """Exécute une simulation de démonstration"""
     print("=== DÉMONSTRATION MODÈLE PALUDISME ===")
@@ -240,11 +427,7 @@ def export_results_to_csv_json(results, csv_path='simulation_results.csv', json_
         print(f"✗ Impossible d'écrire JSON: {e}")
 
     # Export CSV : on crée un tableau temps x variables
-    keys_order = [
-        't',
-        'S11','V11','I11','S12','V12','I12','S13','V13','I13',
-        'S_total','V_total','I_total','N_total','prevalence','couverture'
-    ]
+    keys_order = ('t',) + VARIABLES
     available_keys = [k for k in keys_order if k in results]
 
     try:
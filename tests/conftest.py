@@ -0,0 +1,6 @@
+"""Configuration commune des tests : les modules de `malaria_lib` s'importent à plat (`import simulation`)."""
+import os
+import sys
+
+os.environ.setdefault('MPLBACKEND', 'Agg')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'malaria_lib'))
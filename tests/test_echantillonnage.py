@@ -0,0 +1,44 @@
+import unittest
+
+import numpy as np
+
+from echantillonnage import simulation_adaptative
+from modele import compiler
+from simulation import Parametres
+
+
+class TestSimulationAdaptative(unittest.TestCase):
+    def test_points_et_evenements(self):
+        sortie = simulation_adaptative(t_span=(0, 3650), seuils_prevalence=[0.1])
+        self.assertLess(len(sortie), 200)
+        self.assertEqual(len(sortie.evenements['pic_prevalence']), 1)
+        self.assertIn(sortie.evenements['pic_prevalence'][0], sortie.t)
+
+        grille = np.linspace(0, 3650, 2000)
+        dense = np.array(sortie.reechantillonner(grille)['prevalence'])
+        resultats = sortie.vers_dict()
+        interpolee = np.interp(grille, resultats['t'], resultats['prevalence'])
+        self.assertLess(np.abs(interpolee - dense).max(), 2e-3 * np.ptp(dense))
+        self.assertAlmostEqual(max(resultats['prevalence']), dense.max(), places=5)
+
+    def test_horizon_long(self):
+        for params in (Parametres(), Parametres(theta_1=0, theta_2=0, theta_3=0)):
+            sortie = simulation_adaptative(params, t_span=(0, 36500), method='LSODA', seuils_prevalence=[0.1])
+            self.assertLess(len(sortie), 200)
+            self.assertEqual(len(sortie.evenements['pic_prevalence']), 1)
+
+    def test_proche_equilibre(self):
+        rhs, jac = compiler().fonctions(Parametres())
+        equilibre = np.linalg.solve(jac(0, None), -rhs(0, np.zeros(9)))
+        sortie = simulation_adaptative(y0=equilibre * 1.001, t_span=(0, 3650))
+        self.assertLess(len(sortie), 100)
+        self.assertEqual(len(sortie.evenements['pic_prevalence']), 0)
+
+    def test_sans_sortie_dense(self):
+        sortie = simulation_adaptative(conserver_dense=False, dt_max=10)
+        self.assertLessEqual(np.diff(sortie.t).max(), 10 + 1e-9)
+        self.assertEqual(len(sortie.reechantillonner([1.0, 2.0])['t']), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import pickle
+import unittest
+
+import numpy as np
+
+from ensemble import AgregateurEnsemble, fusionner_agregateurs
+from simulation import calculer_indicateurs
+
+
+class TestAgregateurEnsemble(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.t = np.linspace(0, 1, 4)
+        self.lot = rng.lognormal(size=(3000, 4, 9)) + 1
+        self.complet = calculer_indicateurs(self.lot)
+
+    def test_moments_et_fusion(self):
+        a = AgregateurEnsemble(self.t)
+        for trajectoire in self.lot[:1000]:
+            a.ajouter(trajectoire)
+        b = AgregateurEnsemble(self.t)
+        b.ajouter_lot(self.lot[1000:])
+        b = pickle.loads(pickle.dumps(b))
+        total = fusionner_agregateurs([a, b])
+        self.assertEqual(total.n, len(self.lot))
+        np.testing.assert_allclose(total.moyenne(), self.complet.mean(axis=0))
+        np.testing.assert_allclose(total.variance(), self.complet.var(axis=0, ddof=1))
+
+    def test_quantiles(self):
+        agg = AgregateurEnsemble(self.t)
+        agg.ajouter_lot(self.lot)
+        mediane = agg.quantiles(0.5)
+        np.testing.assert_allclose(mediane, np.median(self.complet, axis=0), rtol=0.01)
+        extremes = agg.quantiles([0.0, 1.0])
+        np.testing.assert_allclose(extremes[0], self.complet.min(axis=0))
+        np.testing.assert_allclose(extremes[1], self.complet.max(axis=0))
+
+    def test_grilles_incompatibles(self):
+        with self.assertRaises(ValueError):
+            AgregateurEnsemble(self.t).fusionner(AgregateurEnsemble(self.t[:3]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+import numpy as np
+
+from metriques import TableScenarios, tableau_indicateurs
+
+
+class TestMetriques(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.t = np.linspace(0, 10, 11)
+        self.y = rng.random((5, 11, 9)) * 100 + 1
+
+    def test_indicateurs(self):
+        table = tableau_indicateurs(self.y, self.t, {'d': 0.1})
+        I_total = self.y[:, :, 2] + self.y[:, :, 5] + self.y[:, :, 8]
+        prevalence = I_total / self.y.sum(axis=2)
+        np.testing.assert_allclose(table['pic_prevalence'], prevalence.max(axis=1))
+        np.testing.assert_allclose(table['temps_pic'], self.t[prevalence.argmax(axis=1)])
+        aire = ((I_total[:, 1:] + I_total[:, :-1]) / 2).sum(axis=1)
+        np.testing.assert_allclose(table['aire_infectes'], aire)
+        np.testing.assert_allclose(table['deces_paludisme'], 0.1 * aire)
+
+    def test_parametre_inconnu(self):
+        with self.assertRaises(ValueError):
+            tableau_indicateurs(self.y, self.t, {'beta': 0.5, 'foo': 1})
+
+    def test_filtrer_classer(self):
+        table = TableScenarios({'a': np.array([3.0, 1.0, 2.0, 5.0]), 'b': np.arange(4)})
+        self.assertEqual(table.filtrer(a=(2.0, None))['b'].tolist(), [0, 2, 3])
+        self.assertEqual(table.classer('a', decroissant=True, n=2)['b'].tolist(), [3, 0])
+
+    def test_ligne_par_entier(self):
+        table = TableScenarios({'a': np.array([3.0, 1.0]), 'b': np.arange(2)})
+        self.assertEqual(table[1], {'a': 1.0, 'b': 1})
+        self.assertEqual(len(table[1:]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import copy
+import unittest
+
+import numpy as np
+
+from modele import MODELE_GROUPE1, compiler
+from simulation import LotParametres, Parametres, systeme_equations
+
+
+class TestModeleCompile(unittest.TestCase):
+    def setUp(self):
+        self.modele = compiler()
+        self.params = Parametres(beta=0.7, theta_2=0.03)
+        self.y = np.random.default_rng(1).random(9) * 1000
+
+    def test_cache(self):
+        self.assertIs(compiler(MODELE_GROUPE1), self.modele)
+
+    def test_rhs_identique_aux_equations(self):
+        rhs, _ = self.modele.fonctions(self.params)
+        np.testing.assert_allclose(rhs(0, self.y), systeme_equations(0, self.y, self.params), rtol=1e-12)
+
+    def test_jacobien_et_sparsite(self):
+        rhs, jac = self.modele.fonctions(self.params)
+        J = jac(0, self.y)
+        base = np.asarray(systeme_equations(0, self.y, self.params))
+        numerique = np.column_stack([np.asarray(systeme_equations(0, self.y + e, self.params)) - base
+                                     for e in np.eye(9)])
+        np.testing.assert_allclose(J, numerique, atol=1e-9)
+        self.assertTrue(np.all(self.modele.sparsite | (J == 0)))
+
+    def test_rhs_lot(self):
+        lot = LotParametres.depuis_liste([Parametres(), self.params])
+        rhs_lot, _ = self.modele.fonctions(lot)
+        rhs, _ = self.modele.fonctions(self.params)
+        Y = np.column_stack([self.y, self.y])
+        np.testing.assert_allclose(rhs_lot(0, Y)[:, 1], rhs(0, self.y))
+
+    def test_resoudre_lot(self):
+        lot = LotParametres.depuis_liste([Parametres(), self.params])
+        t_eval = np.linspace(0, 50, 11)
+        seul = self.modele.resoudre(self.params, self.y, (0, 50), t_eval=t_eval, method='BDF', rtol=1e-8)
+        for method in ('BDF', 'RK45'):
+            sol = self.modele.resoudre(lot, self.y, (0, 50), t_eval=t_eval, method=method, rtol=1e-8)
+            self.assertTrue(sol.success)
+            self.assertEqual(sol.y.shape, (9, 2, 11))
+            np.testing.assert_allclose(sol.y[:, 1], seul.y, rtol=1e-5)
+
+    def test_flux_constants_internes_et_sortants(self):
+        spec = {
+            'compartiments': ['A', 'B'],
+            'flux': [
+                {'de': None, 'vers': 'A', 'taux': '3'},
+                {'de': 'A', 'vers': 'B', 'taux': '2', 'facteur': None},
+                {'de': 'B', 'vers': None, 'taux': 'mu', 'facteur': None},
+                {'de': 'A', 'vers': 'B', 'taux': 'delta'},
+            ],
+        }
+        modele = compiler(spec)
+        rhs, _ = modele.fonctions(self.params)
+        rhs_lot, _ = modele.fonctions(LotParametres.depuis_liste([self.params]))
+        y = np.array([7.0, 4.0])
+        attendu = [3 - 2 - self.params.delta * 7, 2 - self.params.mu + self.params.delta * 7]
+        np.testing.assert_allclose(rhs(0, y), attendu)
+        np.testing.assert_allclose(rhs_lot(0, y[:, None])[:, 0], attendu)
+
+    def test_flux_non_conservatif_refuse(self):
+        spec = copy.deepcopy(MODELE_GROUPE1)
+        del spec['flux'][-1]['ouvert']
+        with self.assertRaises(ValueError):
+            compiler(spec)
+
+    def test_noms_de_taux_invalides(self):
+        for nom in ('lambda-x', 'lambda', 'beta', 'Nv', 'S11'):
+            spec = copy.deepcopy(MODELE_GROUPE1)
+            spec['taux'][nom] = '1'
+            with self.assertRaises(ValueError):
+                compiler(spec)
+
+    def test_bilan(self):
+        bilan = self.modele.bilan['V11']
+        self.assertEqual(len(bilan['apports']), 1)
+        self.assertEqual(len(bilan['sorties']), 1)
+        self.assertEqual(len(bilan['ouverts']), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import os
+import tempfile
+import unittest
+
+from parameters import charger_parametres_csv, validate_params_dict
+from simulation import Parametres
+
+
+class TestChargerParametresCsv(unittest.TestCase):
+    def _ecrire(self, contenu):
+        fd, chemin = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(contenu)
+        self.addCleanup(os.remove, chemin)
+        return chemin
+
+    def test_format_name_value(self):
+        chemin = self._ecrire("name,value\nbeta,0.9\ntheta-1,0.02\nfoo,3\n")
+        params = charger_parametres_csv(chemin)
+        self.assertIsInstance(params, Parametres)
+        self.assertEqual(params.beta, 0.9)
+        self.assertEqual(params.theta_1, 0.02)
+        self.assertEqual(params.mu, Parametres().mu)
+
+    def test_format_entetes(self):
+        chemin = self._ecrire("beta,b 2\n0.7,1.5\n")
+        params = charger_parametres_csv(chemin)
+        self.assertEqual((params.beta, params.b_2), (0.7, 1.5))
+
+    def test_dict(self):
+        chemin = self._ecrire("name,value\nbeta,0.4\nc,0.2\n")
+        self.assertEqual(charger_parametres_csv(chemin, as_instance=False), {'beta': 0.4, 'c': 0.2})
+
+    def test_validation(self):
+        chemin = self._ecrire("name,value\nbeta,50\n")
+        params = charger_parametres_csv(chemin, raise_on_error=False)
+        self.assertEqual(params.beta, 50)
+        self.assertTrue(validate_params_dict({'beta': 50}, raise_on_error=False))
+
+
+if __name__ == '__main__':
+    unittest.main()
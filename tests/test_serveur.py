@@ -0,0 +1,111 @@
+import json
+import threading
+import time
+import unittest
+import urllib.request
+
+from charge_serveur import mesurer_charge
+from serveur import ServeurSimulation, creer_serveur
+from simulation import Parametres
+
+
+JOB_A = {'parametres': {'beta': 0.6}, 'n_points': 5}
+JOB_B = {'parametres': {'beta': 0.8}, 'n_points': 5}
+
+
+class TestServeurSimulation(unittest.TestCase):
+    def test_regroupement_et_cache(self):
+        serveur = ServeurSimulation(fenetre=0.2)
+        f1, cache1 = serveur.soumettre(JOB_A)
+        f2, cache2 = serveur.soumettre(dict(JOB_A))
+        self.assertIs(f1, f2)
+        self.assertFalse(cache1 or cache2)
+        resultat = f1.result(timeout=30)
+        self.assertEqual(len(resultat['t']), 5)
+
+        f3, cache3 = serveur.soumettre(JOB_A)
+        self.assertTrue(cache3)
+        self.assertEqual(f3.result(), resultat)
+        self.assertEqual(serveur.statistiques['regroupees'], 1)
+        self.assertEqual(serveur.statistiques['cache'], 1)
+        self.assertEqual(serveur.statistiques['calculees'], 1)
+
+    def test_parametre_inconnu(self):
+        with self.assertRaises(ValueError):
+            ServeurSimulation().soumettre({'parametres': {'foo': 1}})
+
+    def test_echec_de_lot_isole(self):
+        class ServeurFragile(ServeurSimulation):
+            def _resoudre(self, jobs):
+                if len(jobs) > 1 or jobs[0]['parametres'][Parametres.INDEX['beta']] == 0.8:
+                    raise RuntimeError("échec")
+                return super()._resoudre(jobs)
+
+        serveur = ServeurFragile(fenetre=0.2)
+        fa, _ = serveur.soumettre(JOB_A)
+        fb, _ = serveur.soumettre(JOB_B)
+        self.assertEqual(len(fa.result(timeout=30)['t']), 5)
+        with self.assertRaises(RuntimeError):
+            fb.result(timeout=30)
+
+    def test_fermer(self):
+        serveur = ServeurSimulation()
+        future, _ = serveur.soumettre(JOB_A)
+        self.assertEqual(len(future.result(timeout=30)['t']), 5)
+        serveur.fermer(delai=5)
+        self.assertFalse(serveur._travailleur.is_alive())
+        with self.assertRaises(RuntimeError):
+            serveur.soumettre(JOB_B)
+        serveur.fermer()
+
+
+class TestServeurHTTP(unittest.TestCase):
+    def setUp(self):
+        self.httpd = creer_serveur(port=0, fenetre=0.05)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def tearDown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def test_jobs_dupliques(self):
+        corps = json.dumps({'jobs': [JOB_A, JOB_A, JOB_B]}).encode('utf-8')
+        requete = urllib.request.Request(self.url + '/simuler', data=corps)
+        with urllib.request.urlopen(requete) as reponse:
+            lignes = [json.loads(ligne) for ligne in reponse]
+        self.assertEqual(sorted(ligne['index'] for ligne in lignes), [0, 1, 2])
+        par_index = {ligne['index']: ligne['resultat'] for ligne in lignes}
+        self.assertEqual(par_index[0], par_index[1])
+        self.assertNotEqual(par_index[0]['I11'], par_index[2]['I11'])
+
+    def test_delai_depasse(self):
+        serveur = self.httpd.RequestHandlerClass.serveur_simulation
+        serveur.delai_max = 0.05
+        resoudre = serveur._resoudre
+        serveur._resoudre = lambda jobs: time.sleep(0.5) or resoudre(jobs)
+        corps = json.dumps(JOB_B).encode('utf-8')
+        with urllib.request.urlopen(urllib.request.Request(self.url + '/simuler', data=corps)) as reponse:
+            lignes = [json.loads(ligne) for ligne in reponse]
+        self.assertEqual(lignes, [{'index': 0, 'cache': False, 'erreur': "Délai dépassé"}])
+
+    def test_charge_avec_echecs(self):
+        serveur = self.httpd.RequestHandlerClass.serveur_simulation
+        resoudre = serveur._resoudre
+
+        def resoudre_fragile(jobs):
+            if any(job['parametres'][Parametres.INDEX['beta']] > 0.5 for job in jobs):
+                raise RuntimeError("échec")
+            return resoudre(jobs)
+
+        serveur._resoudre = resoudre_fragile
+        mesures = mesurer_charge(self.url, n_requetes=40, n_scenarios=10, concurrence=4)
+        self.assertEqual(mesures['reussies'] + mesures['echecs'], 40)
+        self.assertGreater(mesures['echecs'], 0)
+        self.assertGreater(mesures['reussies'], 0)
+        self.assertAlmostEqual(mesures['taux_erreur'], mesures['echecs'] / 40)
+        self.assertLessEqual(mesures['p50_ms'], mesures['max_ms'])
+
+
+if __name__ == '__main__':
+    unittest.main()
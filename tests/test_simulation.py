@@ -0,0 +1,68 @@
+import pickle
+import unittest
+
+import numpy as np
+
+from simulation import LotParametres, Parametres, systeme_equations
+
+
+class TestParametres(unittest.TestCase):
+    def test_valeurs_par_defaut(self):
+        params = Parametres()
+        self.assertEqual(params.vers_dict(), dict(zip(Parametres.CHAMPS, Parametres.DEFAUTS)))
+        with self.assertRaises(AttributeError):
+            params.inconnu = 1
+
+    def test_vecteur_sans_copie(self):
+        params = Parametres(beta=0.8)
+        vecteur = params.vers_vecteur()
+        autre = Parametres.depuis_vecteur(vecteur)
+        autre.beta = 0.1
+        self.assertEqual(params.beta, 0.1)
+        self.assertTrue(np.shares_memory(vecteur, autre.vers_vecteur()))
+        self.assertEqual(Parametres(vecteur.copy()), params)
+
+    def test_remplacer(self):
+        params = Parametres().remplacer(beta=0.9, c=0.1)
+        self.assertEqual((params.beta, params.c), (0.9, 0.1))
+        with self.assertRaises(ValueError):
+            params.remplacer(foo=1)
+
+    def test_cle_hash_pickle(self):
+        a, b = Parametres(beta=0.9), Parametres(beta=0.9)
+        self.assertEqual(a.cle(), b.cle())
+        self.assertEqual(a, b)
+        with self.assertRaises(TypeError):
+            hash(a)
+        self.assertEqual(len({a.cle(), b.cle()}), 1)
+        cache = {a.cle(): 'a'}
+        a.remplacer(beta=0.1)
+        self.assertIn(b.cle(), cache)
+        self.assertNotIn(a.cle(), cache)
+        a.beta = 0.9
+        self.assertNotEqual(a.cle(), Parametres().cle())
+        copie = pickle.loads(pickle.dumps(a))
+        self.assertEqual(copie, a)
+        self.assertEqual(copie.cle(), a.cle())
+
+    def test_lot(self):
+        lot = LotParametres.repeter(1000)
+        lot.remplacer(beta=np.linspace(0.1, 1.0, 1000))
+        self.assertEqual(lot[999].beta, 1.0)
+        self.assertTrue(np.shares_memory(lot[5].vers_vecteur(), lot.valeurs))
+        self.assertEqual(len(lot[:10]), 10)
+        lot[0].c = 0.9
+        self.assertEqual(lot.colonne('c')[0], 0.9)
+
+
+class TestSystemeEquations(unittest.TestCase):
+    def test_instance_ou_vecteur(self):
+        params = Parametres(beta=0.7)
+        y = np.random.default_rng(1).random(9) * 1000
+        attendu = systeme_equations(0, y, params)
+        self.assertEqual(systeme_equations(0, y, params.vers_vecteur()), attendu)
+        self.assertEqual(systeme_equations(0, y, params.vers_vecteur().tolist()), attendu)
+
+
+if __name__ == '__main__':
+    unittest.main()